@@ -9,7 +9,7 @@
 #   1. S3イベント通知を受信
 #   2. イベントからバケット名とオブジェクトキーを抽出
 #   3. ファイル拡張子をチェック（.txt, .md のみ処理）
-#   4. AgentCore Runtimeに非同期処理をリクエスト（即座にACKを受信）
+#   4. AgentCore Runtimeに非同期処理をバッチ単位で並列にリクエスト（即座にACKを受信）
 #   5. 処理受付結果をレスポンスとして返却
 #
 # 非同期実行の利点:
@@ -19,32 +19,47 @@
 #
 # 環境変数:
 #   - AGENTCORE_RUNTIME_ENDPOINT: AgentCore RuntimeのエンドポイントURL
-#   - AGENTCORE_RUNTIME_ID: AgentCore RuntimeのID
+#   - AGENTCORE_RUNTIME_ARN: AgentCore RuntimeのARN
+#   - AGENTCORE_MAX_CONCURRENCY: AgentCore Runtimeの最大同時呼び出し数（デフォルト: 16）
+#   - LOG_LEVEL: ログレベル（デフォルト: INFO）
 # =============================================================================
 
 from __future__ import annotations
 
+import asyncio
+import functools
 import json
 import logging
 import os
+import re
+import threading
 import urllib.parse
+from concurrent.futures import ThreadPoolExecutor
 from typing import Any
 
 import boto3
+from botocore.config import Config
 from botocore.exceptions import ClientError
 
+# orjson（任意依存）: 利用可能な場合はJSONシリアライズを高速化する
+try:
+    import orjson
+except ImportError:
+    orjson = None  # type: ignore[assignment]
+
 # -----------------------------------------------------------------------------
 # ロガーの設定
 # -----------------------------------------------------------------------------
 # Lambdaでは標準のloggingモジュールを使用
+# ログレベルはTerraformで設定される LOG_LEVEL 環境変数に従う（デフォルト: INFO）
 logger = logging.getLogger()
-logger.setLevel(logging.INFO)
+logger.setLevel(os.environ.get("LOG_LEVEL", "INFO").upper())
 
 # -----------------------------------------------------------------------------
 # 環境変数から設定を読み込み
 # -----------------------------------------------------------------------------
-# AgentCore RuntimeのエンドポイントURL
-# 例: "https://xxx.bedrock-agentcore.us-east-1.amazonaws.com"
+# AgentCore RuntimeのエンドポイントURL（未指定の場合はリージョンから自動解決）
+# 例: "https://bedrock-agentcore.us-east-1.amazonaws.com"
 AGENTCORE_RUNTIME_ENDPOINT = os.environ.get("AGENTCORE_RUNTIME_ENDPOINT", "")
 
 # AgentCore RuntimeのARN
@@ -53,12 +68,62 @@ AGENTCORE_RUNTIME_ARN = os.environ.get("AGENTCORE_RUNTIME_ARN", "")
 # 対応するファイル拡張子
 SUPPORTED_EXTENSIONS = {".txt", ".md"}
 
+# 処理対象のキーのパターン（uploadsディレクトリ配下の .txt / .md ファイル）
+# NOTE: SUPPORTED_EXTENSIONS と内容を揃えること
+_TARGET_KEY_PATTERN = re.compile(r"/uploads/.*\.(?i:txt|md)\Z", re.DOTALL)
+
+# AgentCore Runtimeの1回の呼び出しにまとめるオブジェクト数の上限
+# ペイロードサイズを小さく保つため、バッチを分割する
+INVOCATION_BATCH_SIZE = 25
+
+# AgentCore Runtime呼び出しの最大並列数
+# バースト時のスロットリングを避けるため、スレッドプールの大きさで同時呼び出し数を制限する
+# NOTE: AGENTCORE_CLIENT_CONFIG の max_pool_connections はこの値以上に設定される
+# NOTE: 不正な値の場合はデフォルト値を使用し、0以下の値は1に切り上げる
+DEFAULT_MAX_PARALLEL_INVOCATIONS = 16
+try:
+    MAX_PARALLEL_INVOCATIONS = max(
+        1,
+        int(os.environ.get("AGENTCORE_MAX_CONCURRENCY", str(DEFAULT_MAX_PARALLEL_INVOCATIONS))),
+    )
+except ValueError:
+    logger.warning(
+        "AGENTCORE_MAX_CONCURRENCY が不正なため、デフォルト値を使用します: value=%s, default=%d",
+        os.environ.get("AGENTCORE_MAX_CONCURRENCY"), DEFAULT_MAX_PARALLEL_INVOCATIONS,
+    )
+    MAX_PARALLEL_INVOCATIONS = DEFAULT_MAX_PARALLEL_INVOCATIONS
+
+# JSONエンコーダー（orjson非導入時のフォールバック）
+# 呼び出しごとのエンコーダー生成を避けるため、モジュールスコープで1つだけ作成する
+# 区切り文字の空白を除去し、ペイロードとレスポンスを縮小する
+_json_encode = json.JSONEncoder(ensure_ascii=False, separators=(",", ":")).encode
+
+# 処理完了ログに出力するエラー詳細の最大件数
+SUMMARY_LOG_MAX_ERRORS = 10
+
 # -----------------------------------------------------------------------------
 # Bedrock AgentCoreクライアントの初期化
 # -----------------------------------------------------------------------------
 # NOTE: Terraformで設定されるIAMロールにより、
 #       bedrock-agentcore:InvokeAgentRuntime 権限が付与される
-agentcore_client = boto3.client("bedrock-agentcore")
+# NOTE: クライアントは初回の呼び出し時に作成してモジュールスコープに保持し、
+#       ウォームスタート時にTCP/TLS接続を再利用する
+#       全レコードがスキップされるイベントではクライアントを作成しない
+#   - max_pool_connections: 複数レコード処理時の接続プールを拡大
+#     並列呼び出し数が多い場合も接続待ちが発生しないよう、並列数以上を確保する
+#   - tcp_keepalive: アイドル時の接続切断を防止
+#   - retries: スロットリング時はadaptiveモードでリトライ
+AGENTCORE_CLIENT_CONFIG = Config(
+    max_pool_connections=max(50, MAX_PARALLEL_INVOCATIONS),
+    tcp_keepalive=True,
+    connect_timeout=3,
+    read_timeout=30,
+    retries={"mode": "adaptive", "max_attempts": 3},
+)
+# NOTE: Sessionはウォームスタート間で共有し、認証情報プロバイダーのキャッシュを再利用する
+_boto3_session = boto3.session.Session()
+_agentcore_client: Any = None
+_agentcore_client_lock = threading.Lock()
 
 
 def handler(event: dict[str, Any], context: Any) -> dict[str, Any]:
@@ -68,6 +133,10 @@ def handler(event: dict[str, Any], context: Any) -> dict[str, Any]:
     S3イベント通知を受け取り、AgentCore Runtimeに非同期処理をリクエストする。
     AgentCore Runtimeは即座にACKを返し、処理はバックグラウンドで実行される。
 
+    accepted は AgentCore Runtime へのリクエスト送信に成功した（2xx を受信した）ことを表す。
+    ACKのボディは解析しないため、Runtime側のキー検証などで要素単位に拒否された
+    ファイルも accepted に含まれる（拒否理由はRuntimeのログに出力される）。
+
     Args:
         event: S3イベント通知
             {
@@ -75,7 +144,7 @@ def handler(event: dict[str, Any], context: Any) -> dict[str, Any]:
                     {
                         "s3": {
                             "bucket": {"name": "bucket-name"},
-                            "object": {"key": "path/to/file.txt"}
+                            "object": {"key": "path/to/file.txt", "size": 1024}
                         }
                     }
                 ]
@@ -87,13 +156,15 @@ def handler(event: dict[str, Any], context: Any) -> dict[str, Any]:
             {
                 "statusCode": 200,
                 "body": {
-                    "accepted": [...],  # 処理を受け付けたファイル
+                    "accepted": [...],  # AgentCore Runtimeに送信したファイル
                     "skipped": [...],   # スキップされたファイル
                     "errors": [...]     # エラーが発生したファイル
                 }
             }
     """
-    logger.info(f"イベント受信: {json.dumps(event, ensure_ascii=False)}")
+    # イベント全体のシリアライズはコストが高いため、DEBUG有効時のみ行う
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("イベント受信: %s", _json_dumps(event))
 
     # 処理結果を格納するリスト
     accepted = []  # 処理を受け付けたファイル（非同期実行中）
@@ -105,55 +176,61 @@ def handler(event: dict[str, Any], context: Any) -> dict[str, Any]:
 
     if not records:
         logger.warning("処理対象のレコードがありません")
-        return {
-            "statusCode": 200,
-            "body": json.dumps({
-                "message": "処理対象のレコードがありません",
-                "accepted": [],
-                "skipped": [],
-                "errors": [],
-            }, ensure_ascii=False),
-        }
+        return _build_response(200, {
+            "message": "処理対象のレコードがありません",
+            "accepted": [],
+            "skipped": [],
+            "errors": [],
+        })
+
+    # 呼び出し対象の (bucket, key, size) を収集
+    # S3は同一オブジェクトの通知を重複して配信することがあるため、重複を除外する
+    # NOTE: レコード単位のスキップ・エラーはログ出力せず、最後にサマリーとしてまとめて出力する
+    work: list[tuple[str, str, int | None]] = []
+    seen: set[tuple[str, str]] = set()
 
     for record in records:
+        # 抽出前に例外が発生した場合もエラー情報を記録できるよう初期化
+        bucket, key = "", ""
         try:
             # S3イベント情報を抽出
-            s3_info = record.get("s3", {})
-            bucket = s3_info.get("bucket", {}).get("name", "")
-            # URLエンコードされたキーをデコード
-            key = urllib.parse.unquote_plus(
-                s3_info.get("object", {}).get("key", "")
-            )
+            bucket, key, size = _extract_s3_object(record)
 
-            logger.info(f"処理対象: s3://{bucket}/{key}")
+            logger.debug("処理対象: s3://%s/%s", bucket, key)
 
             # バケット名とキーの検証
             if not bucket or not key:
                 error_msg = "バケット名またはキーが取得できません"
-                logger.error(error_msg)
                 errors.append({"bucket": bucket, "key": key, "error": error_msg})
                 continue
 
-            # ファイル拡張子のチェック
-            file_extension = get_file_extension(key)
-            if file_extension not in SUPPORTED_EXTENSIONS:
-                skip_msg = (
-                    f"サポートされていない拡張子のためスキップ: {file_extension}"
-                )
-                logger.info(skip_msg)
+            # 拡張子・ディレクトリのチェック
+            skip_msg = _get_skip_reason(key)
+            if skip_msg:
                 skipped.append({"bucket": bucket, "key": key, "reason": skip_msg})
                 continue
 
-            # uploadsディレクトリ配下かチェック
-            if "/uploads/" not in key:
-                skip_msg = "uploadsディレクトリ配下ではないためスキップ"
-                logger.info(skip_msg)
+            # 重複通知のチェック
+            if (bucket, key) in seen:
+                skip_msg = "重複したイベント通知のためスキップ"
                 skipped.append({"bucket": bucket, "key": key, "reason": skip_msg})
                 continue
 
-            # AgentCore Runtimeに非同期処理をリクエスト
-            result = invoke_agentcore_runtime(bucket, key)
+            seen.add((bucket, key))
+            work.append((bucket, key, size))
+
+        except Exception as e:
+            # 予期しないエラー
+            logger.exception("レコード処理中にエラーが発生: %s", e)
+            errors.append({"bucket": bucket, "key": key, "error": str(e)})
 
+    # AgentCore Runtimeに非同期処理を並列でリクエスト
+    # 各レコードは独立しているため、ネットワーク待ちをイベントループ上で重ね合わせる
+    if work:
+        results = asyncio.run(invoke_agentcore_runtime_all(work))
+
+        # バッチ単位の結果を (bucket, key) 単位に展開して集計
+        for (bucket, key, _), result in zip(work, results, strict=True):
             if result.get("accepted"):
                 accepted.append({
                     "bucket": bucket,
@@ -168,35 +245,160 @@ def handler(event: dict[str, Any], context: Any) -> dict[str, Any]:
                     "error": result.get("message"),
                 })
 
-        except Exception as e:
-            # 予期しないエラー
-            logger.exception(f"レコード処理中にエラーが発生: {e}")
-            errors.append({
-                "bucket": bucket if "bucket" in dir() else "unknown",
-                "key": key if "key" in dir() else "unknown",
-                "error": str(e),
-            })
-
-    # 処理結果のサマリーをログ出力
-    logger.info(
-        f"処理完了: accepted={len(accepted)}, "
-        f"skipped={len(skipped)}, errors={len(errors)}"
-    )
-
-    return {
-        "statusCode": 200 if not errors else 207,  # 207 = Multi-Status
-        "body": json.dumps({
+    # 処理結果のサマリーを1行にまとめてログ出力
+    # エラーの詳細はログサイズを抑えるため先頭の件数のみ出力する
+    summary_log = {
+        "accepted": len(accepted),
+        "skipped": len(skipped),
+        "errors": len(errors),
+        "error_details": errors[:SUMMARY_LOG_MAX_ERRORS],
+    }
+    if errors:
+        logger.warning("処理完了: %s", _json_dumps(summary_log))
+    else:
+        logger.info("処理完了: %s", _json_dumps(summary_log))
+
+    return _build_response(
+        200 if not errors else 207,  # 207 = Multi-Status
+        {
             "accepted": accepted,
             "skipped": skipped,
             "errors": errors,
-        }, ensure_ascii=False),
+        },
+    )
+
+
+def _build_response(status_code: int, body: dict[str, Any]) -> dict[str, Any]:
+    """
+    Lambdaのレスポンスを作成する。
+
+    ボディのシリアライズは _json_dumps（orjson利用可能時はorjson）で1回だけ行う。
+    NOTE: Lambdaのレスポンスはバイト列を扱えないため、ボディは文字列で返す。
+
+    Args:
+        status_code: ステータスコード
+        body: レスポンスボディ
+
+    Returns:
+        statusCode と JSON文字列の body を含むレスポンス
+    """
+    return {
+        "statusCode": status_code,
+        "body": _json_dumps(body),
     }
 
 
+def _json_dumps_bytes(obj: Any) -> bytes:
+    """
+    オブジェクトをUTF-8のJSONバイト列にシリアライズする。
+
+    orjsonが利用可能な場合はバイト列を直接生成し、再エンコードを省略する。
+
+    Args:
+        obj: シリアライズ対象のオブジェクト
+
+    Returns:
+        JSONバイト列
+    """
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return _json_encode(obj).encode("utf-8")
+
+
+def _json_dumps(obj: Any) -> str:
+    """
+    オブジェクトをJSON文字列にシリアライズする。
+
+    Args:
+        obj: シリアライズ対象のオブジェクト
+
+    Returns:
+        JSON文字列（非ASCII文字はエスケープしない）
+    """
+    if orjson is not None:
+        return orjson.dumps(obj).decode("utf-8")
+    return _json_encode(obj)
+
+
+def _extract_s3_object(record: dict[str, Any]) -> tuple[str, str, int | None]:
+    """
+    S3イベントレコードからバケット名、デコード済みのオブジェクトキー、サイズを取り出す。
+
+    Args:
+        record: S3イベントレコード
+
+    Returns:
+        (バケット名, オブジェクトキー, サイズ)。
+        バケット名・キーが取得できない場合はいずれも空文字列、
+        サイズが含まれない場合は None。
+    """
+    # 正常なレコードではデフォルト値の辞書を生成せず、直接参照する
+    try:
+        s3_info = record["s3"]
+        bucket = s3_info["bucket"]["name"]
+        s3_object = s3_info["object"]
+        raw_key = s3_object["key"]
+    except (KeyError, TypeError):
+        return "", "", None
+
+    # オブジェクトサイズ（削除イベント等では含まれない）
+    size = s3_object.get("size")
+
+    # URLエンコードされたキーをデコード
+    return bucket, _unquote_s3_key(raw_key), size
+
+
+def _unquote_s3_key(key: str) -> str:
+    """
+    S3イベント通知のURLエンコードされたオブジェクトキーをデコードする。
+
+    エンコード対象の文字を含まないキーはそのまま返し、デコード処理を省略する。
+
+    Args:
+        key: URLエンコードされたS3オブジェクトキー
+
+    Returns:
+        デコード済みのS3オブジェクトキー
+    """
+    if "%" not in key and "+" not in key:
+        return key
+    return urllib.parse.unquote_plus(key)
+
+
+def _get_skip_reason(key: str) -> str | None:
+    """
+    オブジェクトキーが処理対象外である理由を返す。
+
+    Args:
+        key: デコード済みのS3オブジェクトキー
+
+    Returns:
+        スキップ理由。処理対象の場合は None。
+    """
+    # 処理対象のキーは1回の正規表現マッチで判定する
+    if _TARGET_KEY_PATTERN.search(key):
+        return None
+
+    # 以降はスキップ理由の特定のみ
+    # ファイル拡張子のチェック
+    file_extension = get_file_extension(key)
+    if file_extension not in SUPPORTED_EXTENSIONS:
+        return f"サポートされていない拡張子のためスキップ: {file_extension}"
+
+    # uploadsディレクトリ配下かチェック
+    if "/uploads/" not in key:
+        return "uploadsディレクトリ配下ではないためスキップ"
+
+    return None
+
+
+@functools.lru_cache(maxsize=1024)
 def get_file_extension(key: str) -> str:
     """
     S3キーからファイル拡張子を取得する。
 
+    再配信などで同一キーが繰り返し現れるため、結果をキャッシュする。
+
     Args:
         key: S3オブジェクトキー
 
@@ -211,48 +413,142 @@ def get_file_extension(key: str) -> str:
         >>> get_file_extension("path/to/file")
         ""
     """
-    if "." not in key:
+    # rpartition は末尾の区切りのみを探索し、リストを生成しない
+    _, sep, extension = key.rpartition(".")
+    if not sep:
         return ""
-    return "." + key.split(".")[-1].lower()
+    return "." + extension.lower()
+
+
+async def invoke_agentcore_runtime_all(
+    work: list[tuple[str, str, int | None]],
+) -> list[dict[str, Any]]:
+    """
+    複数のS3オブジェクトについてAgentCore Runtimeを並列に呼び出す。
+
+    呼び出し対象を INVOCATION_BATCH_SIZE 件ずつのバッチに分割し、
+    バッチごとに1回の呼び出しでまとめてリクエストする。
+    boto3クライアントは同期APIのため、run_in_executor でスレッドプールに委譲し、
+    asyncio.gather で全ての呼び出しを待ち合わせる。
+
+    Args:
+        work: 呼び出し対象の (バケット名, キー, サイズ) のリスト
+
+    Returns:
+        各オブジェクトの処理受付結果（work と同じ順序）
+    """
+    loop = asyncio.get_running_loop()
+    batches = [
+        work[i:i + INVOCATION_BATCH_SIZE]
+        for i in range(0, len(work), INVOCATION_BATCH_SIZE)
+    ]
+    max_workers = min(MAX_PARALLEL_INVOCATIONS, len(batches))
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        batch_results = await asyncio.gather(*[
+            loop.run_in_executor(executor, invoke_agentcore_runtime_batch, batch)
+            for batch in batches
+        ])
+
+    # バッチ単位の結果を各オブジェクトに割り当てる
+    return [
+        result
+        for batch, result in zip(batches, batch_results, strict=True)
+        for _ in batch
+    ]
+
+
+def _get_agentcore_client() -> Any:
+    """
+    Bedrock AgentCoreクライアントを取得する（初回呼び出し時に作成）。
+
+    複数スレッドから同時に呼び出されても、クライアントは1つだけ作成される。
+
+    Returns:
+        bedrock-agentcore のboto3クライアント
+    """
+    global _agentcore_client
+
+    if _agentcore_client is None:
+        with _agentcore_client_lock:
+            if _agentcore_client is None:
+                # エンドポイントURLが指定されている場合は明示的に渡し、
+                # エンドポイント解決処理を省略する
+                _agentcore_client = _boto3_session.client(
+                    "bedrock-agentcore",
+                    endpoint_url=AGENTCORE_RUNTIME_ENDPOINT or None,
+                    config=AGENTCORE_CLIENT_CONFIG,
+                )
+    return _agentcore_client
 
 
-def invoke_agentcore_runtime(bucket: str, key: str) -> dict[str, Any]:
+def invoke_agentcore_runtime_batch(
+    items: list[tuple[str, str, int | None]],
+) -> dict[str, Any]:
     """
-    AgentCore Runtimeに非同期処理をリクエストする。
+    複数のS3オブジェクトの非同期処理をAgentCore Runtimeにまとめてリクエストする。
 
+    1回の呼び出しで複数のオブジェクトを送信し、ネットワーク往復と署名のコストを
+    オブジェクト数で償却する。
     AgentCore Runtimeは即座にACKを返し、処理はバックグラウンドで実行される。
     処理結果はS3に直接保存される。
 
+    受付可否はHTTPステータスコードのみで判定する。
+    ACKに含まれる要素ごとの受付結果（results）は参照しないため、
+    accepted はバッチ全体の送信に成功したことのみを表す。
+
     Args:
-        bucket: S3バケット名
-        key: S3オブジェクトキー
+        items: 処理対象の (バケット名, キー, サイズ) のリスト
 
     Returns:
         処理受付結果
-            - accepted: 処理が受け付けられたかどうか
+            - accepted: バッチの送信に成功したかどうか
             - task_id: 非同期タスクのID（受付成功時）
             - message: 結果メッセージ
     """
-    logger.info(f"AgentCore Runtime呼び出し: runtime_arn={AGENTCORE_RUNTIME_ARN}")
+    logger.debug(
+        "AgentCore Runtime呼び出し: runtime_arn=%s, items=%d",
+        AGENTCORE_RUNTIME_ARN, len(items),
+    )
 
     # リクエストペイロードを作成
+    # サイズを渡すことで、Runtime側でS3にアクセスせずに上限超過を判定できる
     payload = {
-        "bucket": bucket,
-        "key": key,
+        "items": [
+            {"bucket": bucket, "key": key, "size": size}
+            for bucket, key, size in items
+        ],
     }
 
     try:
         # AgentCore Runtimeを呼び出し（Fire & Forget）
         # レスポンスはストリーミングだが、リクエスト送信時点で処理開始される
-        response = agentcore_client.invoke_agent_runtime(
+        response = _get_agentcore_client().invoke_agent_runtime(
             agentRuntimeArn=AGENTCORE_RUNTIME_ARN,
-            payload=json.dumps(payload).encode("utf-8"),
+            payload=_json_dumps_bytes(payload),
         )
 
         # レスポンスメタデータをログ出力
-        logger.info(f"AgentCore Runtime呼び出し成功: keys={list(response.keys())}")
+        logger.debug("AgentCore Runtime呼び出し成功: keys=%s", list(response.keys()))
+
+        # AgentCore Runtimeは add_async_task() 登録直後にACKのみを返すため、
+        # ボディは処理完了を待たずに返却される
+        # ACKの内容は解析せずに読み捨て、接続をプールに返却して再利用可能にする
+        body = response.get("response")
+        if body is not None:
+            body.read()
+            body.close()
+
+        # 受付可否はボディを解析せずHTTPステータスコードのみで判定する
+        status_code = response.get("ResponseMetadata", {}).get("HTTPStatusCode", 0)
+        if not 200 <= status_code < 300:
+            error_msg = f"AgentCore Runtimeが異常なステータスを返しました: {status_code}"
+            logger.error(error_msg)
+            return {
+                "accepted": False,
+                "message": error_msg,
+            }
 
-        # ストリーミングレスポンスは消費せずに成功とみなす
         # AgentCore Runtime側でバックグラウンド処理が開始されている
         return {
             "accepted": True,
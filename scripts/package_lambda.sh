@@ -100,13 +100,19 @@ if [ -f "lambda/requirements.txt" ]; then
     echo ""
     echo "[2.5/4] 依存関係を確認中..."
 
-    # requirements.txtの内容を確認
-    if grep -qv "^#" lambda/requirements.txt | grep -qv "^boto3"; then
+    # requirements.txtの内容を確認（コメント・空行・boto3以外の依存関係があるか）
+    if grep -vE "^(#|$|boto3)" lambda/requirements.txt | grep -q .; then
         echo "追加の依存関係があります。インストールします..."
-        pip install \
+        # boto3はLambdaランタイムのものを使用するため除外
+        # Lambda（arm64 / Python 3.12）向けのバイナリwheelを取得
+        grep -vE "^boto3" lambda/requirements.txt | pip install \
             --target "$OUTPUT_DIR/lambda_package" \
+            --platform manylinux2014_aarch64 \
+            --implementation cp \
+            --python-version 3.12 \
+            --only-binary=:all: \
             --quiet \
-            -r lambda/requirements.txt
+            -r /dev/stdin
     else
         echo "boto3のみのため、追加インストールはスキップします"
     fi
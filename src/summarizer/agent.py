@@ -6,6 +6,7 @@
 #   文脈を踏まえた要約を生成するエージェント
 #
 # 処理フロー:
+#   0. セマンティックキャッシュを確認（有効時のみ、類似ドキュメントの要約があれば再利用）
 #   1. AgentCoreMemoryから関連事実をセマンティック検索
 #   2. S3からテキストファイルを読み取り
 #   3. 過去の事実を参照しながらClaude Haiku 4.5で要約生成
@@ -15,23 +16,30 @@
 
 from __future__ import annotations
 
+import functools
 import logging
 import os
+import threading
 from datetime import datetime, timezone
-from typing import Any
+from typing import TYPE_CHECKING, Any
 
-from bedrock_agentcore.memory import MemoryClient
-from bedrock_agentcore.memory.integrations.strands.config import (
-    AgentCoreMemoryConfig,
-    RetrievalConfig,
-)
-from bedrock_agentcore.memory.integrations.strands.session_manager import (
-    AgentCoreMemorySessionManager,
-)
+import boto3
+from botocore.config import Config
+from botocore.exceptions import BotoCoreError, ClientError
 from strands import Agent
 from strands.models import BedrockModel
+from strands.tools.executors import ConcurrentToolExecutor
 
-from .tools import read_text_file, save_summary
+from . import semantic_cache
+from .tools import copy_summary, read_text_file, save_summary, summary_exists
+
+# NOTE: AgentCoreMemoryの連携モジュールはインポートに時間がかかるため、
+#       使用する関数内で遅延インポートし、コールドスタートを短縮する
+if TYPE_CHECKING:
+    from bedrock_agentcore.memory.integrations.strands.config import RetrievalConfig
+    from bedrock_agentcore.memory.integrations.strands.session_manager import (
+        AgentCoreMemorySessionManager,
+    )
 
 # -----------------------------------------------------------------------------
 # ロガーの設定
@@ -52,9 +60,43 @@ MODEL_ID = os.environ.get(
 )
 
 # セマンティック検索の設定
-# 関連事実を最大10件取得、関連度スコア0.5以上
-RETRIEVAL_TOP_K = 10
-RETRIEVAL_RELEVANCE_SCORE = 0.5
+# 関連事実を最大10件取得、関連度スコア0.5以上（環境変数で調整可能）
+# NOTE: AgentCoreMemoryのベクトルストアはマネージドで埋め込み次元を変更できないため、
+#       検索コストは取得件数と閾値で調整する
+RETRIEVAL_TOP_K = int(os.environ.get("RETRIEVAL_TOP_K", "10"))
+RETRIEVAL_RELEVANCE_SCORE = float(os.environ.get("RETRIEVAL_RELEVANCE_SCORE", "0.5"))
+
+# プロンプトに埋め込むドキュメントの最大文字数
+# これを超える部分はモデルのコンテキスト長を圧迫するため切り捨てる
+MAX_DOCUMENT_CHARS = 100_000
+
+# -----------------------------------------------------------------------------
+# AgentCoreMemory用のboto3セッション
+# -----------------------------------------------------------------------------
+# セッションマネージャーはリクエストごとに作成するが、boto3セッションと接続設定は再利用する
+# セッションではサービスモデルや認証情報の解決結果が再利用され、クライアント生成が軽くなる
+# NOTE: boto3.Session はスレッドセーフではないため、ワーカースレッドごとに1つ作成する
+#       （セッションマネージャーの生成はAgentCoreMemoryへの通信を伴うため、ロックで直列化しない）
+MEMORY_CLIENT_CONFIG = Config(
+    max_pool_connections=50,
+    tcp_keepalive=True,
+    retries={"mode": "adaptive", "max_attempts": 5},
+)
+_memory_boto_sessions = threading.local()
+
+
+def _get_memory_boto_session() -> boto3.Session:
+    """
+    現在のスレッド用のboto3セッションを取得する（初回呼び出し時に作成）。
+
+    Returns:
+        AgentCoreMemoryのクライアント生成に使用するboto3セッション
+    """
+    session: boto3.Session | None = getattr(_memory_boto_sessions, "session", None)
+    if session is None:
+        session = boto3.Session(region_name=AWS_REGION)
+        _memory_boto_sessions.session = session
+    return session
 
 # -----------------------------------------------------------------------------
 # システムプロンプト
@@ -63,7 +105,7 @@ SUMMARIZER_SYSTEM_PROMPT = """
 あなたは文書要約アシスタントです。
 
 ## 役割
-- アップロードされたテキストファイルを読み取り、要約を生成します
+- 指示に含まれるドキュメント内容をもとに、要約を生成します
 - 過去に処理したドキュメントからの関連情報がある場合は、それを参照して文脈を踏まえた要約を作成します
 
 ## 要約のルール
@@ -93,6 +135,77 @@ SUMMARIZER_SYSTEM_PROMPT = """
 （長期記憶に保存すべき重要な事実を箇条書きで列挙）
 """
 
+# -----------------------------------------------------------------------------
+# エージェントへの指示テンプレート
+# -----------------------------------------------------------------------------
+# {bucket}, {key}, {summary_key}, {content} を format_map で埋め込む
+SUMMARIZER_PROMPT_TEMPLATE = """
+以下のドキュメントの要約を生成してください。
+
+## 対象ドキュメント
+- S3バケット: {bucket}
+- S3キー: {key}
+
+## 処理手順
+1. 下記のドキュメント内容を分析し、要約を生成してください
+2. save_summary ツールを使って要約を保存してください
+   - バケット: {bucket}
+   - キー: {summary_key}
+
+過去の関連情報がある場合は、それを参照して文脈を踏まえた要約を作成してください。
+
+## ドキュメント内容
+{content}
+"""
+
+
+@functools.cache
+def get_model() -> BedrockModel:
+    """
+    Bedrockモデルを取得する。
+
+    BedrockModelはリクエストごとの状態を持たないため、プロセス内で1度だけ作成し、
+    ウォームスタート時のboto3クライアント生成と設定検証を省略する。
+
+    Returns:
+        設定済みのBedrockモデル
+    """
+    logger.info("Bedrockモデル作成: model_id=%s", MODEL_ID)
+
+    return BedrockModel(
+        model_id=MODEL_ID,
+        # ConverseStream APIで応答を逐次受信する（SDKのデフォルトだが意図を明示）
+        streaming=True,
+        # 追加のリクエストパラメータ
+        additional_request_fields={
+            # thinkingモードを無効化（高速化のため）
+            "thinking": {"type": "disabled"},
+        },
+    )
+
+
+@functools.lru_cache(maxsize=512)
+def _get_retrieval_config(actor_id: str) -> dict[str, RetrievalConfig]:
+    """
+    ユーザーごとの関連事実の検索設定を取得する。
+
+    セッションIDに依存しないため、ユーザー単位でキャッシュして再利用する。
+
+    Args:
+        actor_id: ユーザーID
+
+    Returns:
+        /facts/{actorId} ネームスペースの検索設定
+    """
+    from bedrock_agentcore.memory.integrations.strands.config import RetrievalConfig
+
+    return {
+        f"/facts/{actor_id}": RetrievalConfig(
+            top_k=RETRIEVAL_TOP_K,
+            relevance_score=RETRIEVAL_RELEVANCE_SCORE,
+        )
+    }
+
 
 def create_session_manager(
     memory_id: str,
@@ -113,7 +226,12 @@ def create_session_manager(
     Returns:
         設定済みのセッションマネージャー
     """
-    logger.info(f"セッションマネージャー作成: memory_id={memory_id}, actor_id={actor_id}")
+    from bedrock_agentcore.memory.integrations.strands.config import AgentCoreMemoryConfig
+    from bedrock_agentcore.memory.integrations.strands.session_manager import (
+        AgentCoreMemorySessionManager,
+    )
+
+    logger.info("セッションマネージャー作成: memory_id=%s, actor_id=%s", memory_id, actor_id)
 
     # AgentCoreMemoryの設定
     # /facts/{actorId} ネームスペースからセマンティック検索
@@ -122,18 +240,16 @@ def create_session_manager(
         session_id=session_id,
         actor_id=actor_id,
         # 関連事実の検索設定
-        retrieval_config={
-            f"/facts/{actor_id}": RetrievalConfig(
-                top_k=RETRIEVAL_TOP_K,
-                relevance_score=RETRIEVAL_RELEVANCE_SCORE,
-            )
-        },
+        retrieval_config=_get_retrieval_config(actor_id),
     )
 
     # セッションマネージャーを作成
+    # 内部のboto3クライアントは現在のスレッドのセッションから生成させる
     session_manager = AgentCoreMemorySessionManager(
         agentcore_memory_config=config,
         region_name=AWS_REGION,
+        boto_session=_get_memory_boto_session(),
+        boto_client_config=MEMORY_CLIENT_CONFIG,
     )
 
     return session_manager
@@ -143,7 +259,7 @@ def create_agent(session_manager: AgentCoreMemorySessionManager) -> Agent:
     """
     Strands Agentを作成する。
 
-    Claude Haiku 4.5を使用し、カスタムツールとセッションマネージャーを設定。
+    Claude Haiku 4.5を使用し、要約保存ツールとセッションマネージャーを設定。
 
     Args:
         session_manager: AgentCoreMemory用セッションマネージャー
@@ -151,24 +267,20 @@ def create_agent(session_manager: AgentCoreMemorySessionManager) -> Agent:
     Returns:
         設定済みのStrands Agent
     """
-    logger.info(f"Strands Agent作成: model_id={MODEL_ID}")
-
-    # Bedrockモデルの設定
-    model = BedrockModel(
-        model_id=MODEL_ID,
-        # 追加のリクエストパラメータ
-        additional_request_fields={
-            # thinkingモードを無効化（高速化のため）
-            "thinking": {"type": "disabled"},
-        },
-    )
+    logger.info("Strands Agent作成: model_id=%s", MODEL_ID)
 
     # エージェントを作成
+    # NOTE: Agentは会話履歴などの状態を持ち、セッションごとに異なるため毎回作成する
+    #       Bedrockモデルのみプロセス内で共有する
     agent = Agent(
-        model=model,
+        model=get_model(),
         system_prompt=SUMMARIZER_SYSTEM_PROMPT,
         # カスタムツールを設定
-        tools=[read_text_file, save_summary],
+        # NOTE: ドキュメントはプロンプトに埋め込むため、読み取りツールは渡さない
+        tools=[save_summary],
+        # 1回の応答で複数のツール呼び出しがあった場合は並行して実行する
+        # （S3への保存など、I/O待ちのツールのレイテンシを重ね合わせる）
+        tool_executor=ConcurrentToolExecutor(),
         # セッションマネージャー（長期記憶）
         session_manager=session_manager,
     )
@@ -176,26 +288,79 @@ def create_agent(session_manager: AgentCoreMemorySessionManager) -> Agent:
     return agent
 
 
+def _reuse_cached_summary(
+    bucket: str,
+    content: str,
+    actor_id: str,
+    summary_key: str,
+) -> tuple[bool, list[float] | None]:
+    """
+    セマンティックキャッシュから類似ドキュメントの要約を再利用する。
+
+    ドキュメントの埋め込みを計算し、他のドキュメントの類似した要約が見つかった場合は
+    S3のサーバーサイドコピーで要約の保存先にコピーする。
+    キャッシュの参照・コピーに失敗した場合はキャッシュミスとして扱う。
+
+    Args:
+        bucket: S3バケット名
+        content: ドキュメントの内容
+        actor_id: ユーザーID
+        summary_key: 要約の保存先S3キー
+
+    Returns:
+        (キャッシュヒットしたか, ドキュメントの埋め込みベクトル)
+        埋め込みの計算に失敗した場合、埋め込みは None。
+    """
+    try:
+        embedding = semantic_cache.embed_text(content)
+    except (ClientError, BotoCoreError, KeyError, ValueError) as e:
+        logger.warning("埋め込みの計算に失敗したため、キャッシュを使用しません: %s", e)
+        return False, None
+
+    # 同じファイルの再アップロード（内容の編集を含む）では自身の古いエントリを除外し、
+    # 要約を再生成する
+    cached_key = semantic_cache.find_cached_summary(
+        actor_id, embedding, exclude_summary_key=summary_key
+    )
+    if cached_key is None:
+        return False, embedding
+
+    # キャッシュ元の要約が削除されている場合などはキャッシュミスとして扱う
+    result = copy_summary(bucket, cached_key, summary_key)
+    if result["status"] != "success":
+        return False, embedding
+
+    logger.info("キャッシュされた要約を再利用: %s → %s", cached_key, summary_key)
+    return True, embedding
+
+
 def process_document(
     bucket: str,
     key: str,
     actor_id: str,
     memory_id: str,
+    size: int | None = None,
 ) -> dict[str, Any]:
     """
     ドキュメントを処理して要約を生成する。
 
     メインの処理関数。以下のステップを実行:
-    1. セッションマネージャーを作成（過去の事実を検索可能に）
-    2. Strands Agentを作成
-    3. エージェントにドキュメント処理を依頼
-    4. 結果を返却
+    1. S3からドキュメントを読み取り
+    2. セマンティックキャッシュを確認（有効時のみ、ヒットした場合は要約を再利用して終了）
+    3. セッションマネージャーを作成（過去の事実を検索可能に）
+    4. Strands Agentを作成
+    5. ドキュメント内容をプロンプトに含めてエージェントに要約を依頼
+    6. 結果を返却
+
+    ドキュメントは事前に読み取ってプロンプトに埋め込むため、
+    エージェントが読み取りツールを呼び出すためのLLM往復が発生しない。
 
     Args:
         bucket: S3バケット名
         key: S3オブジェクトキー（例: "alice/uploads/report.txt"）
         actor_id: ユーザーID
         memory_id: AgentCoreMemoryのID
+        size: オブジェクトサイズ（バイト、S3イベント通知から取得できた場合）
 
     Returns:
         処理結果を含む辞書
@@ -203,7 +368,7 @@ def process_document(
             - summary_key: 保存された要約のS3キー
             - message: 結果メッセージ
     """
-    logger.info(f"ドキュメント処理開始: bucket={bucket}, key={key}")
+    logger.info("ドキュメント処理開始: bucket=%s, key=%s", bucket, key)
 
     # ファイル名を取得
     filename = key.split("/")[-1]
@@ -214,7 +379,7 @@ def process_document(
     timestamp = datetime.now(timezone.utc).strftime("%Y%m%d_%H%M%S")
     session_id = f"{filename_without_ext}_{timestamp}"
 
-    logger.info(f"セッションID生成: {session_id}")
+    logger.info("セッションID生成: %s", session_id)
 
     # 要約の保存先キーを生成
     # {user_id}/uploads/{filename} → {user_id}/summaries/{filename}.summary.txt
@@ -222,6 +387,24 @@ def process_document(
     summary_key = f"{path_parts[0]}/summaries/{filename}.summary.txt"
 
     try:
+        # ドキュメントを読み取り
+        content = read_text_file(bucket, key, expected_size=size)
+
+        # セマンティックキャッシュを確認
+        # 類似ドキュメントの要約があれば、エージェントを実行せずに再利用する
+        embedding = None
+        if semantic_cache.is_enabled():
+            cache_hit, embedding = _reuse_cached_summary(
+                bucket, content, actor_id, summary_key
+            )
+            if cache_hit:
+                return {
+                    "success": True,
+                    "summary_key": summary_key,
+                    "message": "類似ドキュメントの要約を再利用しました",
+                    "session_id": session_id,
+                }
+
         # セッションマネージャーを作成
         # 過去の関連事実がセマンティック検索で取得される
         session_manager = create_session_manager(
@@ -233,31 +416,41 @@ def process_document(
         # Strands Agentを作成
         agent = create_agent(session_manager)
 
+        # コンテキスト長を超えないよう、長すぎるドキュメントは先頭のみを使用
+        if len(content) > MAX_DOCUMENT_CHARS:
+            logger.warning(
+                "ドキュメントが長いため先頭 %d 文字のみを要約します: 文字数=%d",
+                MAX_DOCUMENT_CHARS, len(content),
+            )
+            content = content[:MAX_DOCUMENT_CHARS]
+
         # エージェントへの指示
         # 過去の関連事実は自動的にコンテキストに含まれる
-        prompt = f"""
-以下のドキュメントを読み取り、要約を生成してください。
-
-## 対象ドキュメント
-- S3バケット: {bucket}
-- S3キー: {key}
-
-## 処理手順
-1. read_text_file ツールを使ってドキュメントを読み取ってください
-2. 内容を分析し、要約を生成してください
-3. save_summary ツールを使って要約を保存してください
-   - バケット: {bucket}
-   - キー: {summary_key}
-
-過去の関連情報がある場合は、それを参照して文脈を踏まえた要約を作成してください。
-"""
+        prompt = SUMMARIZER_PROMPT_TEMPLATE.format_map({
+            "bucket": bucket,
+            "key": key,
+            "summary_key": summary_key,
+            "content": content,
+        })
 
         logger.info("エージェント実行開始")
 
         # エージェントを実行
         response = agent(prompt)
 
-        logger.info(f"エージェント実行完了: {response}")
+        logger.info("エージェント実行完了: %s", response)
+
+        # 次回以降の類似ドキュメントのために埋め込みを保存
+        # save_summary がエラーを返した場合もエージェントは完了するため、
+        # 要約の保存を確認できた場合のみ保存する
+        if embedding is not None:
+            if summary_exists(bucket, summary_key):
+                semantic_cache.store_summary_embedding(actor_id, summary_key, key, embedding)
+            else:
+                logger.warning(
+                    "要約の保存を確認できないため、埋め込みを保存しません: summary_key=%s",
+                    summary_key,
+                )
 
         # 成功レスポンスを返却
         return {
@@ -269,7 +462,7 @@ def process_document(
 
     except Exception as e:
         # エラーハンドリング
-        logger.exception(f"ドキュメント処理エラー: {e}")
+        logger.exception("ドキュメント処理エラー: %s", e)
         return {
             "success": False,
             "summary_key": None,
@@ -7,7 +7,7 @@
 #
 # 処理フロー:
 #   1. プロキシLambdaからHTTPリクエストを受信
-#   2. ペイロードからS3バケット名とキーを取得
+#   2. ペイロードからS3バケット名とキーを取得（items 指定時は複数件）
 #   3. 即座にACKレスポンスを返却
 #   4. バックグラウンドでエージェントによる要約処理を実行
 #   5. 処理完了後、S3に結果を保存
@@ -22,7 +22,8 @@ from __future__ import annotations
 
 import logging
 import os
-import threading
+import re
+from concurrent.futures import ThreadPoolExecutor
 from typing import Any
 
 from bedrock_agentcore.runtime import BedrockAgentCoreApp
@@ -40,6 +41,11 @@ logging.basicConfig(
     force=True,  # 既存の設定を上書き
 )
 
+# ログフォーマットで使用しないスレッド・プロセス情報の収集を省略
+logging.logThreads = False
+logging.logProcesses = False
+logging.logMultiprocessing = False
+
 # このモジュール用のロガー
 logger = logging.getLogger(__name__)
 
@@ -52,18 +58,50 @@ AGENTCORE_MEMORY_ID = os.environ.get("AGENTCORE_MEMORY_ID", "")
 # S3バケット名（Terraformで設定）
 S3_BUCKET_NAME = os.environ.get("S3_BUCKET_NAME", "")
 
+# バックグラウンド処理の最大並列数
+# I/O待ちが中心の処理のため、CPU数より多めのワーカーを割り当てる
+# NOTE: 不正な値の場合はデフォルト値を使用し、0以下の値は1に切り上げる
+DEFAULT_MAX_PARALLEL_REQUESTS = (os.cpu_count() or 1) * 5
+try:
+    MAX_PARALLEL_REQUESTS = max(
+        1,
+        int(os.environ.get("MAX_PARALLEL_REQUESTS", str(DEFAULT_MAX_PARALLEL_REQUESTS))),
+    )
+except ValueError:
+    logger.warning(
+        "MAX_PARALLEL_REQUESTS が不正なため、デフォルト値を使用します: value=%s, default=%d",
+        os.environ.get("MAX_PARALLEL_REQUESTS"), DEFAULT_MAX_PARALLEL_REQUESTS,
+    )
+    MAX_PARALLEL_REQUESTS = DEFAULT_MAX_PARALLEL_REQUESTS
+
+# -----------------------------------------------------------------------------
+# 定数定義
+# -----------------------------------------------------------------------------
+# S3キーのパターン: {user_id}/uploads/{filename}
+# 3階層以上のキーを受け付け、先頭をユーザーID、末尾をファイル名として1回の照合で取り出す
+# NOTE: uploads の位置はプロキシLambda側で判定するため、ここでは階層数のみを検証する
+_KEY_PATTERN = re.compile(r"(?P<user>[^/]*)/(?:[^/]*/)+(?P<file>[^/]*)\Z")
+
 # -----------------------------------------------------------------------------
 # AgentCore Runtimeアプリケーションの初期化
 # -----------------------------------------------------------------------------
 logger.info("=" * 60)
 logger.info("AgentCore Runtime アプリケーション初期化開始")
-logger.info(f"AGENTCORE_MEMORY_ID: {AGENTCORE_MEMORY_ID or '(未設定)'}")
-logger.info(f"S3_BUCKET_NAME: {S3_BUCKET_NAME or '(未設定)'}")
+logger.info("AGENTCORE_MEMORY_ID: %s", AGENTCORE_MEMORY_ID or "(未設定)")
+logger.info("S3_BUCKET_NAME: %s", S3_BUCKET_NAME or "(未設定)")
+logger.info("MAX_PARALLEL_REQUESTS: %s", MAX_PARALLEL_REQUESTS)
 logger.info("=" * 60)
 
 app = BedrockAgentCoreApp()
 logger.info("BedrockAgentCoreApp 初期化完了")
 
+# バックグラウンド処理用のスレッドプール
+# リクエストごとにスレッドを生成せず、バースト時もスレッド数を一定に保つ
+_background_executor = ThreadPoolExecutor(
+    max_workers=MAX_PARALLEL_REQUESTS,
+    thread_name_prefix="document-processing",
+)
+
 
 def _run_background_process(
     task_id: str,
@@ -71,12 +109,13 @@ def _run_background_process(
     key: str,
     actor_id: str,
     memory_id: str,
+    size: int | None = None,
 ) -> None:
     """
     バックグラウンドでドキュメント処理を実行する。
 
     処理完了後、非同期タスクを完了としてマークする。
-    この関数はスレッドで実行されるため、メインスレッドをブロックしない。
+    この関数はスレッドプールで実行されるため、メインスレッドをブロックしない。
 
     Args:
         task_id: 非同期タスクのID
@@ -84,8 +123,9 @@ def _run_background_process(
         key: S3オブジェクトキー
         actor_id: ユーザーID
         memory_id: AgentCoreMemoryのID
+        size: オブジェクトサイズ（バイト、不明な場合は None）
     """
-    logger.info(f"バックグラウンド処理開始: task_id={task_id}, key={key}")
+    logger.info("バックグラウンド処理開始: task_id=%s, key=%s", task_id, key)
 
     try:
         # ドキュメント要約処理を実行
@@ -94,63 +134,43 @@ def _run_background_process(
             key=key,
             actor_id=actor_id,
             memory_id=memory_id,
+            size=size,
         )
 
         if result.get("success"):
-            logger.info(f"バックグラウンド処理完了: task_id={task_id}, result={result}")
+            logger.info("バックグラウンド処理完了: task_id=%s, result=%s", task_id, result)
         else:
-            logger.error(f"バックグラウンド処理失敗: task_id={task_id}, result={result}")
+            logger.error("バックグラウンド処理失敗: task_id=%s, result=%s", task_id, result)
 
     except Exception as e:
-        logger.exception(f"バックグラウンド処理中に予期しないエラー: task_id={task_id}, error={e}")
+        logger.exception("バックグラウンド処理中に予期しないエラー: task_id=%s, error=%s", task_id, e)
 
     finally:
         # 非同期タスクを完了としてマーク
         # これにより、Pingステータスが HealthyBusy から Healthy に戻る
         app.complete_async_task(task_id)
-        logger.info(f"非同期タスク完了マーク: task_id={task_id}")
+        logger.info("非同期タスク完了マーク: task_id=%s", task_id)
 
 
-@app.entrypoint
-def invoke(payload: dict[str, Any]) -> dict[str, Any]:
+def _start_document_processing(
+    bucket: str,
+    key: str,
+    size: int | None = None,
+) -> dict[str, Any]:
     """
-    AgentCore Runtimeのエントリポイント（非同期版）。
-
-    プロキシLambdaから送信されたペイロードを受け取り、
-    即座にACKレスポンスを返却した後、バックグラウンドでドキュメント要約処理を実行する。
-
-    この非同期実行により、Lambdaのタイムアウトを超える長時間処理にも対応可能。
+    1件のドキュメントを検証し、バックグラウンド処理を開始する。
 
     Args:
-        payload: リクエストペイロード
-            - bucket: S3バケット名
-            - key: S3オブジェクトキー（例: "alice/uploads/report.txt"）
+        bucket: S3バケット名
+        key: S3オブジェクトキー（例: "alice/uploads/report.txt"）
+        size: オブジェクトサイズ（バイト、S3イベント通知に含まれる場合）
 
     Returns:
         処理受付結果を含む辞書
             - status: "accepted"（受付成功）または "error"（バリデーションエラー）
             - task_id: 非同期タスクのID（受付成功時）
             - message: 結果メッセージ
-
-    Example:
-        >>> payload = {
-        ...     "bucket": "my-bucket",
-        ...     "key": "alice/uploads/report.txt"
-        ... }
-        >>> result = invoke(payload)
-        >>> print(result)
-        {
-            "status": "accepted",
-            "task_id": "abc123-def456",
-            "message": "処理をバックグラウンドで開始しました"
-        }
     """
-    logger.info(f"リクエスト受信: {payload}")
-
-    # ペイロードからS3情報を取得
-    bucket = payload.get("bucket", S3_BUCKET_NAME)
-    key = payload.get("key", "")
-
     # 必須パラメータのバリデーション
     if not bucket:
         error_msg = "バケット名が指定されていません"
@@ -164,16 +184,16 @@ def invoke(payload: dict[str, Any]) -> dict[str, Any]:
 
     # S3キーからActor ID（ユーザーID）を抽出
     # キー構造: {user_id}/uploads/{filename}
-    path_parts = key.split("/")
-    if len(path_parts) < 3:
+    match = _KEY_PATTERN.match(key)
+    if match is None:
         error_msg = f"無効なS3キー形式です: {key}（期待: {{user_id}}/uploads/{{filename}}）"
         logger.error(error_msg)
         return {"status": "error", "message": error_msg}
 
-    actor_id = path_parts[0]
-    filename = path_parts[-1]
+    actor_id = match["user"]
+    filename = match["file"]
 
-    logger.info(f"処理受付: actor_id={actor_id}, filename={filename}")
+    logger.info("処理受付: actor_id=%s, filename=%s", actor_id, filename)
 
     # 非同期タスクを登録
     # add_async_task() により、Pingステータスが HealthyBusy になる
@@ -181,19 +201,14 @@ def invoke(payload: dict[str, Any]) -> dict[str, Any]:
         "document_processing",
         {"bucket": bucket, "key": key, "actor_id": actor_id},
     )
-    logger.info(f"非同期タスク登録: task_id={task_id}")
-
-    # バックグラウンドスレッドで処理を実行
-    # daemon=True により、メインプロセス終了時にスレッドも終了する
-    thread = threading.Thread(
-        target=_run_background_process,
-        args=(task_id, bucket, key, actor_id, AGENTCORE_MEMORY_ID),
-        daemon=True,
+    logger.info("非同期タスク登録: task_id=%s", task_id)
+
+    # バックグラウンドのスレッドプールで処理を実行
+    # ワーカー数を超えたリクエストはキューで待機する
+    _background_executor.submit(
+        _run_background_process, task_id, bucket, key, actor_id, AGENTCORE_MEMORY_ID, size
     )
-    thread.start()
 
-    # 即座にACKレスポンスを返却
-    # 処理はバックグラウンドで継続される
     return {
         "status": "accepted",
         "task_id": task_id,
@@ -201,6 +216,88 @@ def invoke(payload: dict[str, Any]) -> dict[str, Any]:
     }
 
 
+@app.entrypoint
+def invoke(payload: dict[str, Any]) -> dict[str, Any]:
+    """
+    AgentCore Runtimeのエントリポイント（非同期版）。
+
+    プロキシLambdaから送信されたペイロードを受け取り、
+    即座にACKレスポンスを返却した後、バックグラウンドでドキュメント要約処理を実行する。
+
+    この非同期実行により、Lambdaのタイムアウトを超える長時間処理にも対応可能。
+    items を指定した場合は、複数のドキュメントをまとめて受け付ける。
+
+    Args:
+        payload: リクエストペイロード
+            - bucket: S3バケット名
+            - key: S3オブジェクトキー（例: "alice/uploads/report.txt"）
+            - size: オブジェクトサイズ（バイト、省略可）
+            - items: 複数ドキュメントを受け付ける場合の {bucket, key, size} のリスト
+
+    Returns:
+        処理受付結果を含む辞書
+            - status: "accepted"（受付成功）または "error"（バリデーションエラー）
+            - task_id: 非同期タスクのID（受付成功時）
+            - message: 結果メッセージ
+            - results: ドキュメントごとの受付結果（items 指定時のみ）
+
+    Example:
+        >>> payload = {
+        ...     "bucket": "my-bucket",
+        ...     "key": "alice/uploads/report.txt"
+        ... }
+        >>> result = invoke(payload)
+        >>> print(result)
+        {
+            "status": "accepted",
+            "task_id": "abc123-def456",
+            "message": "処理をバックグラウンドで開始しました"
+        }
+    """
+    logger.info("リクエスト受信: %s", payload)
+
+    # 複数ドキュメントのバッチリクエスト
+    items = payload.get("items")
+    if items is not None:
+        if not isinstance(items, list) or not items:
+            error_msg = "items には1件以上の {bucket, key} を指定してください"
+            logger.error(error_msg)
+            return {"status": "error", "message": error_msg}
+
+        results: list[dict[str, Any]] = []
+        for item in items:
+            # 不正な要素はその要素のみエラーとし、残りの受付は継続する
+            if not isinstance(item, dict):
+                error_msg = f"items の要素は {{bucket, key}} のオブジェクトで指定してください: {item!r}"
+                logger.error(error_msg)
+                results.append({"status": "error", "message": error_msg})
+                continue
+
+            results.append(_start_document_processing(
+                item.get("bucket", S3_BUCKET_NAME),
+                item.get("key", ""),
+                item.get("size"),
+            ))
+        accepted_count = sum(1 for result in results if result["status"] == "accepted")
+
+        # 即座にACKレスポンスを返却
+        # 処理はバックグラウンドで継続される
+        return {
+            "status": "accepted" if accepted_count else "error",
+            "results": results,
+            "message": f"{accepted_count}/{len(results)} 件の処理をバックグラウンドで開始しました",
+        }
+
+    # ペイロードからS3情報を取得
+    bucket = payload.get("bucket", S3_BUCKET_NAME)
+    key = payload.get("key", "")
+    size = payload.get("size")
+
+    # 即座にACKレスポンスを返却
+    # 処理はバックグラウンドで継続される
+    return _start_document_processing(bucket, key, size)
+
+
 # -----------------------------------------------------------------------------
 # メイン実行
 # -----------------------------------------------------------------------------
@@ -208,6 +305,6 @@ if __name__ == "__main__":
     # ローカルテスト用
     # 本番環境ではAgentCore Runtimeが自動的に起動する
     logger.info("AgentCore Runtime アプリケーションを起動します...")
-    logger.info(f"AGENTCORE_MEMORY_ID: {AGENTCORE_MEMORY_ID}")
-    logger.info(f"S3_BUCKET_NAME: {S3_BUCKET_NAME}")
+    logger.info("AGENTCORE_MEMORY_ID: %s", AGENTCORE_MEMORY_ID)
+    logger.info("S3_BUCKET_NAME: %s", S3_BUCKET_NAME)
     app.run()
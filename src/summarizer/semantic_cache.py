@@ -0,0 +1,280 @@
+# =============================================================================
+# セマンティックキャッシュ
+# =============================================================================
+# 概要:
+#   内容がほぼ同一のドキュメントについて、過去に生成した要約を再利用するための
+#   キャッシュ。エージェント（Bedrock）の呼び出しを省略し、レイテンシとコストを削減する
+#
+# 仕組み:
+#   1. ドキュメント本文の埋め込みベクトルを Titan Text Embeddings V2 で計算
+#      （256次元・正規化済みで出力し、保存サイズと類似度計算量を抑える）
+#   2. DynamoDBから同一ユーザー（actor_id）の埋め込みを取得
+#   3. コサイン類似度が閾値以上のエントリがあれば、その要約のS3キーを返す
+#      （処理中のドキュメント自身の要約キーのエントリは除外する）
+#   4. キャッシュミス時は要約生成後に埋め込みを保存（TTL付き）
+#
+# 注意:
+#   - 埋め込みは本文の先頭 EMBEDDING_MAX_CHARS 文字のみから計算するため、
+#     それ以降の部分だけが異なるドキュメントは類似度 1.0 となり、同じ要約が再利用される
+#
+# テーブル構造:
+#   - actor_id（パーティションキー）: ユーザーID
+#   - summary_key（ソートキー）: 要約のS3キー
+#     同じファイルを再アップロードした場合、自身の古いエントリは検索対象から除外され、
+#     要約の再生成後に同じキーで上書きされる
+#   - embedding: float32の埋め込みベクトル（バイナリ）
+#   - source_key: 要約元ドキュメントのS3キー
+#   - expires_at: TTL（UNIX時刻）
+#
+# 環境変数:
+#   - SEMANTIC_CACHE_TABLE: DynamoDBテーブル名（未設定の場合はキャッシュ無効）
+#   - SEMANTIC_CACHE_THRESHOLD: キャッシュヒットとみなす類似度の閾値（デフォルト: 0.92）
+#   - SEMANTIC_CACHE_TTL_DAYS: エントリの有効期限（日数、デフォルト: 30）
+#   - EMBEDDING_MODEL_ID: 埋め込みモデルID
+# =============================================================================
+
+from __future__ import annotations
+
+import json
+import logging
+import operator
+import os
+import threading
+import time
+from array import array
+from typing import Any
+
+import boto3
+from botocore.config import Config
+from botocore.exceptions import BotoCoreError, ClientError
+
+# -----------------------------------------------------------------------------
+# ロガーの設定
+# -----------------------------------------------------------------------------
+logger = logging.getLogger(__name__)
+
+# -----------------------------------------------------------------------------
+# 定数定義
+# -----------------------------------------------------------------------------
+# AWSリージョン
+AWS_REGION = os.environ.get("AWS_REGION", "us-east-1")
+
+# キャッシュ用DynamoDBテーブル名（未設定の場合はキャッシュを使用しない）
+SEMANTIC_CACHE_TABLE = os.environ.get("SEMANTIC_CACHE_TABLE", "")
+
+# キャッシュヒットとみなすコサイン類似度の閾値
+SEMANTIC_CACHE_THRESHOLD = float(os.environ.get("SEMANTIC_CACHE_THRESHOLD", "0.92"))
+
+# キャッシュエントリの有効期限（日数）
+SEMANTIC_CACHE_TTL_DAYS = int(os.environ.get("SEMANTIC_CACHE_TTL_DAYS", "30"))
+
+# 埋め込みモデル設定
+# Titan Text Embeddings V2 は出力次元を指定でき、256次元でも検索精度の低下が小さい
+EMBEDDING_MODEL_ID = os.environ.get("EMBEDDING_MODEL_ID", "amazon.titan-embed-text-v2:0")
+EMBEDDING_DIMENSIONS = 256
+
+# 埋め込みに使用する本文の最大文字数
+# Titan Text Embeddings V2 の入力上限（8,192トークン）に収まるよう先頭のみを使用
+EMBEDDING_MAX_CHARS = 8000
+
+# -----------------------------------------------------------------------------
+# AWSクライアントの初期化
+# -----------------------------------------------------------------------------
+# NOTE: 埋め込みはバックグラウンドスレッドから並行して呼び出されるため、接続設定を明示する
+#   - max_pool_connections: スレッド間での接続プール待ちを防止
+#   - tcp_keepalive: アイドル時の接続切断を防ぎ、TLSハンドシェイクを削減
+#   - retries: スロットリング時はadaptiveモードでリトライ
+# NOTE: Titan Text Embeddings V2 の invoke_model は1リクエスト1入力のため、
+#       複数ドキュメントをまとめて埋め込むことはできない
+CLIENT_CONFIG = Config(
+    max_pool_connections=50,
+    tcp_keepalive=True,
+    connect_timeout=3,
+    read_timeout=30,
+    retries={"mode": "adaptive", "max_attempts": 5},
+)
+# NOTE: クライアントは初回使用時にバックグラウンドスレッドから作成されるため、
+#       スレッドセーフではないデフォルトセッションを使わず、専用のSessionからロック下で作成する
+_boto3_session = boto3.session.Session()
+_bedrock_runtime_client: Any = None
+_dynamodb_client: Any = None
+_client_lock = threading.Lock()
+
+
+def _get_bedrock_runtime_client() -> Any:
+    """
+    Bedrock Runtimeクライアントを取得する（初回呼び出し時に作成）。
+
+    キャッシュが無効な場合はクライアントを作成せず、インポート時間を短縮する。
+    複数スレッドから同時に呼び出されても、クライアントは1つだけ作成される。
+
+    Returns:
+        bedrock-runtime のboto3クライアント
+    """
+    global _bedrock_runtime_client
+
+    if _bedrock_runtime_client is None:
+        with _client_lock:
+            if _bedrock_runtime_client is None:
+                _bedrock_runtime_client = _boto3_session.client(
+                    "bedrock-runtime", region_name=AWS_REGION, config=CLIENT_CONFIG
+                )
+    return _bedrock_runtime_client
+
+
+def _get_dynamodb_client() -> Any:
+    """
+    DynamoDBクライアントを取得する（初回呼び出し時に作成）。
+
+    複数スレッドから同時に呼び出されても、クライアントは1つだけ作成される。
+
+    Returns:
+        DynamoDBのboto3クライアント
+    """
+    global _dynamodb_client
+
+    if _dynamodb_client is None:
+        with _client_lock:
+            if _dynamodb_client is None:
+                _dynamodb_client = _boto3_session.client(
+                    "dynamodb", region_name=AWS_REGION, config=CLIENT_CONFIG
+                )
+    return _dynamodb_client
+
+
+def is_enabled() -> bool:
+    """
+    セマンティックキャッシュが有効かどうかを返す。
+
+    Returns:
+        SEMANTIC_CACHE_TABLE が設定されている場合は True
+    """
+    return bool(SEMANTIC_CACHE_TABLE)
+
+
+def embed_text(text: str) -> list[float]:
+    """
+    テキストの埋め込みベクトルを計算する。
+
+    ベクトルは正規化済みのため、内積がそのままコサイン類似度になる。
+
+    Args:
+        text: 埋め込み対象のテキスト
+
+    Returns:
+        正規化済みの埋め込みベクトル（EMBEDDING_DIMENSIONS 次元）
+
+    Raises:
+        ClientError: Bedrockの呼び出しに失敗した場合
+        KeyError: レスポンスに埋め込みが含まれない場合
+        ValueError: レスポンスがJSONとして解析できない場合
+    """
+    response = _get_bedrock_runtime_client().invoke_model(
+        modelId=EMBEDDING_MODEL_ID,
+        contentType="application/json",
+        accept="application/json",
+        body=json.dumps({
+            "inputText": text[:EMBEDDING_MAX_CHARS],
+            "dimensions": EMBEDDING_DIMENSIONS,
+            "normalize": True,
+        }),
+    )
+    body = json.loads(response["body"].read())
+    embedding: list[float] = body["embedding"]
+    return embedding
+
+
+def find_cached_summary(
+    actor_id: str,
+    embedding: list[float],
+    exclude_summary_key: str | None = None,
+) -> str | None:
+    """
+    類似ドキュメントの要約をキャッシュから検索する。
+
+    同一ユーザーの埋め込みのうち、類似度が閾値以上で最も高いエントリを返す。
+    キャッシュの参照に失敗した場合はキャッシュミスとして扱う。
+
+    Args:
+        actor_id: ユーザーID
+        embedding: 検索するドキュメントの埋め込みベクトル（正規化済み）
+        exclude_summary_key: 検索対象から除外する要約のS3キー
+            同じファイルの再アップロード時に、編集前の自身の要約がヒットしないようにする
+
+    Returns:
+        キャッシュされた要約のS3キー。該当なしの場合は None。
+    """
+    best_key: str | None = None
+    best_score = SEMANTIC_CACHE_THRESHOLD
+    now = int(time.time())
+
+    try:
+        paginator = _get_dynamodb_client().get_paginator("query")
+        pages = paginator.paginate(
+            TableName=SEMANTIC_CACHE_TABLE,
+            KeyConditionExpression="actor_id = :actor_id",
+            ExpressionAttributeValues={":actor_id": {"S": actor_id}},
+            ProjectionExpression="summary_key, embedding, expires_at",
+        )
+        for page in pages:
+            for item in page["Items"]:
+                # TTLによる削除は遅延するため、期限切れのエントリは読み飛ばす
+                if int(item["expires_at"]["N"]) <= now:
+                    continue
+
+                # 処理中のドキュメント自身の古いエントリは再利用しない
+                if item["summary_key"]["S"] == exclude_summary_key:
+                    continue
+
+                cached = array("f")
+                cached.frombytes(item["embedding"]["B"])
+                # 正規化済みベクトルの内積 = コサイン類似度
+                score = sum(map(operator.mul, embedding, cached))
+                if score >= best_score:
+                    best_score = score
+                    best_key = item["summary_key"]["S"]
+
+    except (ClientError, BotoCoreError) as e:
+        logger.warning("セマンティックキャッシュの参照に失敗しました: %s", e)
+        return None
+
+    if best_key:
+        logger.info("セマンティックキャッシュヒット: summary_key=%s, score=%.3f", best_key, best_score)
+    return best_key
+
+
+def store_summary_embedding(
+    actor_id: str,
+    summary_key: str,
+    source_key: str,
+    embedding: list[float],
+) -> None:
+    """
+    生成した要約の埋め込みをキャッシュに保存する。
+
+    同じ要約キーのエントリが既にある場合は上書きする（再アップロード時の無効化）。
+    保存に失敗しても要約処理自体は成功しているため、警告ログのみ出力する。
+
+    Args:
+        actor_id: ユーザーID
+        summary_key: 要約のS3キー
+        source_key: 要約元ドキュメントのS3キー
+        embedding: ドキュメントの埋め込みベクトル
+    """
+    expires_at = int(time.time()) + SEMANTIC_CACHE_TTL_DAYS * 24 * 60 * 60
+
+    try:
+        _get_dynamodb_client().put_item(
+            TableName=SEMANTIC_CACHE_TABLE,
+            Item={
+                "actor_id": {"S": actor_id},
+                "summary_key": {"S": summary_key},
+                "source_key": {"S": source_key},
+                "embedding": {"B": array("f", embedding).tobytes()},
+                "expires_at": {"N": str(expires_at)},
+            },
+        )
+        logger.info("セマンティックキャッシュ保存: summary_key=%s", summary_key)
+
+    except (ClientError, BotoCoreError) as e:
+        logger.warning("セマンティックキャッシュの保存に失敗しました: %s", e)
@@ -6,8 +6,12 @@
 # 利用可能なツール:
 # - read_text_file: S3からテキストファイルを読み取る
 # - save_summary: 要約をS3に保存する
+# - copy_summary: 既存の要約をS3上でコピーする
+#
+# 補助関数:
+# - summary_exists: 要約がS3に保存されているかを確認する
 # =============================================================================
 
-from .document_tools import read_text_file, save_summary
+from .document_tools import copy_summary, read_text_file, save_summary, summary_exists
 
-__all__ = ["read_text_file", "save_summary"]
+__all__ = ["copy_summary", "read_text_file", "save_summary", "summary_exists"]
@@ -8,15 +8,20 @@
 # 利用可能なツール:
 #   - read_text_file: S3からテキストファイルを読み取る
 #   - save_summary: 要約をS3に保存する
+#   - copy_summary: 既存の要約をS3上でコピーする
 # =============================================================================
 
 from __future__ import annotations
 
+import codecs
+import functools
 import logging
 import os
-from typing import Literal
+import threading
+from typing import Any, Literal
 
 import boto3
+from botocore.config import Config
 from botocore.exceptions import ClientError
 from strands import tool
 
@@ -32,21 +37,117 @@ logger = logging.getLogger(__name__)
 AWS_REGION = os.environ.get("AWS_REGION", "us-east-1")
 
 # 対応するファイル拡張子
-SUPPORTED_EXTENSIONS = {".txt", ".md"}
+SUPPORTED_EXTENSIONS = frozenset({".txt", ".md"})
 
 # ファイルサイズ上限（10MB）
 # これ以上大きいファイルはLLMのコンテキスト制限に引っかかる可能性がある
 MAX_FILE_SIZE_BYTES = 10 * 1024 * 1024
 
+# S3からの読み取り単位（64KB）
+READ_CHUNK_SIZE_BYTES = 64 * 1024
+
+# 要約ファイルに付与する属性
+SUMMARY_CONTENT_TYPE = "text/plain; charset=utf-8"
+SUMMARY_METADATA = {
+    "generated-by": "strands-doc-summarizer",
+    "content-type": "summary",
+}
+
 # -----------------------------------------------------------------------------
 # S3クライアントの初期化
 # -----------------------------------------------------------------------------
 # NOTE: Lambda/AgentCore Runtime環境では、IAMロールから自動的に認証情報を取得
-s3_client = boto3.client("s3", region_name=AWS_REGION)
+# NOTE: バックグラウンドスレッドから並行して呼び出されるため、接続設定を明示する
+#   - max_pool_connections: スレッド間での接続プール待ちを防止
+#   - tcp_keepalive: アイドル時の接続切断を防ぎ、TLSハンドシェイクを削減
+#   - retries: スロットリング時はadaptiveモードでリトライ
+S3_CLIENT_CONFIG = Config(
+    max_pool_connections=50,
+    tcp_keepalive=True,
+    connect_timeout=3,
+    read_timeout=30,
+    retries={"mode": "adaptive", "max_attempts": 5},
+)
+# NOTE: クライアントは初回使用時にバックグラウンドスレッドから作成されるため、
+#       スレッドセーフではないデフォルトセッションを使わず、専用のSessionからロック下で作成する
+_boto3_session = boto3.session.Session()
+_s3_client: Any = None
+_s3_client_lock = threading.Lock()
+
+
+def _get_s3_client() -> Any:
+    """
+    S3クライアントを取得する（初回呼び出し時に作成）。
+
+    クライアント生成にはサービス定義の読み込みを伴うため、
+    モジュールのインポート時ではなく最初のリクエスト時に行い、コールドスタートを短縮する。
+    複数スレッドから同時に呼び出されても、クライアントは1つだけ作成される。
+
+    Returns:
+        S3のboto3クライアント
+    """
+    global _s3_client
+
+    if _s3_client is None:
+        with _s3_client_lock:
+            if _s3_client is None:
+                _s3_client = _boto3_session.client(
+                    "s3", region_name=AWS_REGION, config=S3_CLIENT_CONFIG
+                )
+    return _s3_client
+
+
+@functools.lru_cache(maxsize=1024)
+def _validate_extension(key: str) -> str:
+    """
+    S3キーの拡張子が対応形式かどうかを検証する。
+
+    同じキーの検証結果はキャッシュされる（例外はキャッシュされない）。
+
+    Args:
+        key: S3オブジェクトキー
+
+    Returns:
+        拡張子（ドット付き、小文字）
+
+    Raises:
+        ValueError: サポートされていないファイル形式の場合
+    """
+    # プロキシLambdaと判定をそろえるため、最後のドット以降を拡張子とする
+    # （os.path.splitext は ".txt" のようなドット始まりの名前を拡張子なしとみなす）
+    _, sep, extension = key.rpartition(".")
+    file_extension = "." + extension.lower() if sep else ""
+    if file_extension not in SUPPORTED_EXTENSIONS:
+        error_msg = (
+            f"サポートされていないファイル形式です: {file_extension} "
+            f"（対応形式: {', '.join(sorted(SUPPORTED_EXTENSIONS))}）"
+        )
+        logger.error(error_msg)
+        raise ValueError(error_msg)
+    return file_extension
+
+
+def _validate_file_size(file_size: int) -> None:
+    """
+    ファイルサイズが上限以内かどうかを検証する。
+
+    Args:
+        file_size: ファイルサイズ（バイト）
+
+    Raises:
+        ValueError: ファイルサイズが上限を超えている場合
+    """
+    if file_size > MAX_FILE_SIZE_BYTES:
+        error_msg = (
+            f"ファイルサイズが上限を超えています: {file_size} bytes "
+            f"（上限: {MAX_FILE_SIZE_BYTES} bytes）"
+        )
+        logger.error(error_msg)
+        raise ValueError(error_msg)
 
 
 @tool
-def read_text_file(bucket: str, key: str) -> str:
+def read_text_file(bucket: str, key: str, expected_size: int | None = None) -> str:
     """
     S3からテキストファイルを読み取る。
 
@@ -62,6 +163,8 @@ def read_text_file(bucket: str, key: str) -> str:
             例: "my-document-bucket"
         key: S3オブジェクトキー
             例: "alice/uploads/report.txt"
+        expected_size: S3イベント通知に含まれるオブジェクトサイズ（バイト、省略可）
+            指定された場合、上限超過のファイルはS3にアクセスせずに拒否する
 
     Returns:
         ファイルの内容（UTF-8テキスト）
@@ -77,54 +180,59 @@ def read_text_file(bucket: str, key: str) -> str:
         >>> print(content[:100])
         "# 月次報告書\\n\\n## 概要\\n..."
     """
-    logger.info(f"ファイル読み取り開始: s3://{bucket}/{key}")
+    logger.info("ファイル読み取り開始: s3://%s/%s", bucket, key)
 
     # ファイル拡張子のチェック
-    file_extension = "." + key.split(".")[-1].lower() if "." in key else ""
-    if file_extension not in SUPPORTED_EXTENSIONS:
-        error_msg = (
-            f"サポートされていないファイル形式です: {file_extension} "
-            f"（対応形式: {', '.join(SUPPORTED_EXTENSIONS)}）"
-        )
-        logger.error(error_msg)
-        raise ValueError(error_msg)
+    _validate_extension(key)
 
-    try:
-        # オブジェクトのメタデータを取得してサイズをチェック
-        head_response = s3_client.head_object(Bucket=bucket, Key=key)
-        file_size = head_response["ContentLength"]
-
-        logger.info(f"ファイルサイズ: {file_size} bytes")
+    # 事前にサイズが分かっている場合は、S3にアクセスする前に上限をチェック
+    if expected_size is not None:
+        _validate_file_size(expected_size)
 
-        # ファイルサイズ上限チェック
-        if file_size > MAX_FILE_SIZE_BYTES:
-            error_msg = (
-                f"ファイルサイズが上限を超えています: {file_size} bytes "
-                f"（上限: {MAX_FILE_SIZE_BYTES} bytes）"
-            )
-            logger.error(error_msg)
-            raise ValueError(error_msg)
+    s3_client = _get_s3_client()
 
-        # ファイル内容を取得
+    try:
+        # オブジェクトを取得
+        # ボディはストリーミングのため、サイズ確認後に読み取る（1回のリクエストで完結）
         response = s3_client.get_object(Bucket=bucket, Key=key)
-        content_bytes = response["Body"].read()
+        file_size = response["ContentLength"]
 
-        # UTF-8としてデコード
+        logger.info("ファイルサイズ: %d bytes", file_size)
+
+        # ファイルサイズ上限チェック
+        # イベント通知後に上書きされた場合に備え、実際のサイズでも確認する
         try:
-            content = content_bytes.decode("utf-8")
+            _validate_file_size(file_size)
+        except ValueError:
+            # ボディを読み取らずに接続を閉じる
+            response["Body"].close()
+            raise
+
+        # ファイル内容をチャンク単位で読み取りながらUTF-8としてデコード
+        # 受信とデコードを重ね合わせ、全体の受信完了を待たずに処理を進める
+        # NOTE: インクリメンタルデコーダーはチャンク境界で分割されたマルチバイト文字も扱える
+        decoder = codecs.getincrementaldecoder("utf-8")()
+        parts: list[str] = []
+        try:
+            for chunk in response["Body"].iter_chunks(READ_CHUNK_SIZE_BYTES):
+                parts.append(decoder.decode(chunk))
+            parts.append(decoder.decode(b"", final=True))
         except UnicodeDecodeError as e:
             # UTF-8以外のエンコーディングの場合
+            response["Body"].close()
             error_msg = f"ファイルをUTF-8としてデコードできません: {e}"
             logger.error(error_msg)
             raise UnicodeDecodeError(
                 "utf-8",
-                content_bytes,
-                0,
-                len(content_bytes),
+                e.object,
+                e.start,
+                e.end,
                 "UTF-8以外のエンコーディングです。UTF-8形式で保存してください。",
-            )
+            ) from e
+
+        content = "".join(parts)
 
-        logger.info(f"ファイル読み取り完了: 文字数={len(content)}")
+        logger.info("ファイル読み取り完了: 文字数=%d", len(content))
         return content
 
     except s3_client.exceptions.NoSuchKey:
@@ -178,25 +286,22 @@ def save_summary(bucket: str, key: str, summary: str) -> dict[str, str]:
             "message": "要約を保存しました"
         }
     """
-    logger.info(f"要約保存開始: s3://{bucket}/{key}")
-    logger.info(f"要約の長さ: {len(summary)} 文字")
+    logger.info("要約保存開始: s3://%s/%s", bucket, key)
+    logger.info("要約の長さ: %d 文字", len(summary))
 
     try:
         # UTF-8でエンコードしてS3に保存
-        s3_client.put_object(
+        _get_s3_client().put_object(
             Bucket=bucket,
             Key=key,
             Body=summary.encode("utf-8"),
-            ContentType="text/plain; charset=utf-8",
+            ContentType=SUMMARY_CONTENT_TYPE,
             # メタデータとして生成情報を付与
-            Metadata={
-                "generated-by": "strands-doc-summarizer",
-                "content-type": "summary",
-            },
+            Metadata=SUMMARY_METADATA,
         )
 
         location = f"s3://{bucket}/{key}"
-        logger.info(f"要約保存完了: {location}")
+        logger.info("要約保存完了: %s", location)
 
         return {
             "status": "success",
@@ -215,3 +320,98 @@ def save_summary(bucket: str, key: str, summary: str) -> dict[str, str]:
             "location": None,
             "message": error_msg,
         }
+
+
+@tool
+def copy_summary(bucket: str, src_key: str, dst_key: str) -> dict[str, str]:
+    """
+    既存の要約をS3上でコピーする。
+
+    類似ドキュメントの要約を再利用する場合に使用する。
+    S3のサーバーサイドコピーのため、要約本文の転送は発生しない。
+
+    Args:
+        bucket: S3バケット名
+            例: "my-document-bucket"
+        src_key: コピー元の要約のS3オブジェクトキー
+            例: "alice/summaries/report_v1.txt.summary.txt"
+        dst_key: コピー先のS3オブジェクトキー
+            例: "alice/summaries/report_v2.txt.summary.txt"
+
+    Returns:
+        コピー結果を含む辞書:
+            - status: "success" または "error"
+            - location: コピー先ファイルのS3 URI
+            - message: 結果メッセージ
+
+    Example:
+        >>> result = copy_summary(
+        ...     "my-bucket",
+        ...     "alice/summaries/report_v1.txt.summary.txt",
+        ...     "alice/summaries/report_v2.txt.summary.txt",
+        ... )
+        >>> print(result)
+        {
+            "status": "success",
+            "location": "s3://my-bucket/alice/summaries/report_v2.txt.summary.txt",
+            "message": "要約をコピーしました"
+        }
+    """
+    logger.info("要約コピー開始: s3://%s/%s → s3://%s/%s", bucket, src_key, bucket, dst_key)
+
+    try:
+        _get_s3_client().copy_object(
+            Bucket=bucket,
+            Key=dst_key,
+            CopySource={"Bucket": bucket, "Key": src_key},
+            ContentType=SUMMARY_CONTENT_TYPE,
+            # save_summary と同じメタデータを付与
+            MetadataDirective="REPLACE",
+            Metadata={**SUMMARY_METADATA, "copied-from": src_key},
+        )
+
+        location = f"s3://{bucket}/{dst_key}"
+        logger.info("要約コピー完了: %s", location)
+
+        return {
+            "status": "success",
+            "location": location,
+            "message": "要約をコピーしました",
+        }
+
+    except ClientError as e:
+        # コピー元が存在しない場合など
+        error_code = e.response.get("Error", {}).get("Code", "Unknown")
+        error_msg = f"要約のコピーに失敗しました（{error_code}）: {e}"
+        logger.error(error_msg)
+
+        return {
+            "status": "error",
+            "location": None,
+            "message": error_msg,
+        }
+
+
+def summary_exists(bucket: str, key: str) -> bool:
+    """
+    要約がS3に保存されているかどうかを確認する。
+
+    エージェントから呼び出すツールではなく、保存結果の確認に使用する。
+    確認に失敗した場合は、保存を確認できなかったものとして False を返す。
+
+    Args:
+        bucket: S3バケット名
+        key: 要約のS3オブジェクトキー
+
+    Returns:
+        要約が存在する場合は True
+    """
+    try:
+        _get_s3_client().head_object(Bucket=bucket, Key=key)
+        return True
+
+    except ClientError as e:
+        error_code = e.response.get("Error", {}).get("Code", "Unknown")
+        if error_code not in ("404", "NoSuchKey", "NotFound"):
+            logger.warning("要約の存在確認に失敗しました（%s）: s3://%s/%s", error_code, bucket, key)
+        return False
@@ -57,6 +57,9 @@ resource "aws_bedrockagentcore_agent_runtime" "summarizer" {
   #   S3_BUCKET_NAME      = aws_s3_bucket.documents.id
   #   AWS_REGION          = local.region
   #   BEDROCK_MODEL_ID    = var.bedrock_model_id
+  #   # セマンティックキャッシュ（semantic_cache_enabled = true の場合のみ）
+  #   SEMANTIC_CACHE_TABLE = var.semantic_cache_enabled ? aws_dynamodb_table.semantic_cache[0].name : ""
+  #   EMBEDDING_MODEL_ID   = var.embedding_model_id
   # }
 
   tags = {
@@ -173,5 +173,8 @@ output "environment_variables" {
     S3_BUCKET_NAME      = aws_s3_bucket.documents.id
     AWS_REGION          = local.region
     BEDROCK_MODEL_ID    = var.bedrock_model_id
+    # セマンティックキャッシュ（無効時は空文字列）
+    SEMANTIC_CACHE_TABLE = var.semantic_cache_enabled ? aws_dynamodb_table.semantic_cache[0].name : ""
+    EMBEDDING_MODEL_ID   = var.embedding_model_id
   }
 }
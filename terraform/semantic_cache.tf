@@ -0,0 +1,91 @@
+# =============================================================================
+# セマンティックキャッシュ設定
+# =============================================================================
+# 概要:
+#   類似ドキュメントの要約を再利用するためのキャッシュ
+#   ドキュメントの埋め込みベクトルをDynamoDBに保存し、
+#   類似度が閾値以上の場合はエージェントを実行せずに要約をS3コピーで再利用する
+#
+# NOTE:
+#   semantic_cache_enabled = true の場合のみ作成される
+#   AgentCore Runtime の環境変数 SEMANTIC_CACHE_TABLE にテーブル名を設定すること
+# =============================================================================
+
+# -----------------------------------------------------------------------------
+# DynamoDBテーブル
+# -----------------------------------------------------------------------------
+resource "aws_dynamodb_table" "semantic_cache" {
+  count = var.semantic_cache_enabled ? 1 : 0
+
+  name         = "${local.name_prefix}-semantic-cache"
+  billing_mode = "PAY_PER_REQUEST"
+
+  # パーティションキー: ユーザーID
+  hash_key = "actor_id"
+  # ソートキー: 要約のS3キー（再アップロード時は同じキーで上書き）
+  range_key = "summary_key"
+
+  attribute {
+    name = "actor_id"
+    type = "S"
+  }
+
+  attribute {
+    name = "summary_key"
+    type = "S"
+  }
+
+  # 有効期限切れのエントリを自動削除
+  ttl {
+    attribute_name = "expires_at"
+    enabled        = true
+  }
+
+  tags = {
+    Name = "${local.name_prefix}-semantic-cache"
+  }
+}
+
+# -----------------------------------------------------------------------------
+# AgentCore Runtime用アクセスポリシー
+# -----------------------------------------------------------------------------
+resource "aws_iam_role_policy" "agentcore_semantic_cache" {
+  count = var.semantic_cache_enabled ? 1 : 0
+
+  name = "${local.name_prefix}-agentcore-semantic-cache-policy"
+  role = aws_iam_role.agentcore_runtime.id
+
+  policy = jsonencode({
+    Version = "2012-10-17"
+    Statement = [
+      {
+        # キャッシュテーブルの読み書き権限
+        Sid    = "SemanticCacheTable"
+        Effect = "Allow"
+        Action = [
+          "dynamodb:Query",
+          "dynamodb:PutItem"
+        ]
+        Resource = aws_dynamodb_table.semantic_cache[0].arn
+      },
+      {
+        # 埋め込みモデルの呼び出し権限
+        Sid    = "EmbeddingInvoke"
+        Effect = "Allow"
+        Action = [
+          "bedrock:InvokeModel"
+        ]
+        Resource = "arn:aws:bedrock:${local.region}::foundation-model/${var.embedding_model_id}"
+      },
+      {
+        # キャッシュされた要約のコピー元として読み取る権限（存在確認の HeadObject を含む）
+        Sid    = "SummaryRead"
+        Effect = "Allow"
+        Action = [
+          "s3:GetObject"
+        ]
+        Resource = "${aws_s3_bucket.documents.arn}/*/summaries/*"
+      }
+    ]
+  })
+}
@@ -98,6 +98,18 @@ variable "agentcore_runtime_memory" {
   default     = 512
 }
 
+variable "semantic_cache_enabled" {
+  description = "セマンティックキャッシュ（類似ドキュメントの要約再利用）を有効にするか"
+  type        = bool
+  default     = false
+}
+
+variable "embedding_model_id" {
+  description = "セマンティックキャッシュで使用する埋め込みモデルID"
+  type        = string
+  default     = "amazon.titan-embed-text-v2:0"
+}
+
 # -----------------------------------------------------------------------------
 # S3設定
 # -----------------------------------------------------------------------------